@@ -1,11 +1,12 @@
 from __future__ import absolute_import
 
-__all__ = ['from_user', 'from_member', 'DEFAULT']
+__all__ = ['from_user', 'from_member', 'from_superuser', 'DEFAULT']
 
 import warnings
 
 from django.conf import settings
 
+from sentry import roles
 from sentry.models import AuthIdentity, AuthProvider, OrganizationMember
 
 
@@ -13,13 +14,10 @@ def _sso_params(member):
     """
     Return a tuple of (requires_sso, sso_is_valid) for a given member.
     """
-    # TODO(dcramer): we want to optimize this access pattern as its several
-    # network hops and needed in a lot of places
-    try:
-        auth_provider = AuthProvider.objects.get(
-            organization=member.organization_id,
-        )
-    except AuthProvider.DoesNotExist:
+    auth_provider = AuthProvider.objects.get_for_organization(
+        member.organization_id,
+    )
+    if auth_provider is None:
         sso_is_valid = True
         requires_sso = False
     else:
@@ -49,11 +47,14 @@ class BaseAccess(object):
     # teams with valid membership
     memberships = ()
     scopes = frozenset()
+    # lookup sets for the above, which are always empty for inactive access
+    # so that checks don't need to branch on is_active
+    _scopes = frozenset()
+    _team_ids = frozenset()
+    _membership_ids = frozenset()
 
     def has_scope(self, scope):
-        if not self.is_active:
-            return False
-        return scope in self.scopes
+        return scope in self._scopes
 
     def has_team(self, team):
         warnings.warn('has_team() is deprecated in favor of has_team_access',
@@ -61,14 +62,10 @@ class BaseAccess(object):
         return self.has_team_access(team)
 
     def has_team_access(self, team):
-        if not self.is_active:
-            return False
-        return team in self.teams
+        return team.id in self._team_ids
 
     def has_team_membership(self, team):
-        if not self.is_active:
-            return False
-        return team in self.memberships
+        return team.id in self._membership_ids
 
     def has_team_scope(self, team, scope):
         return self.has_team_access(team) and self.has_scope(scope)
@@ -90,38 +87,66 @@ class Access(BaseAccess):
         self.memberships = memberships
         self.scopes = scopes
 
+        if is_active:
+            self._scopes = frozenset(scopes)
+            self._team_ids = frozenset(t.id for t in teams)
+            self._membership_ids = frozenset(t.id for t in memberships)
+
         self.is_active = is_active
         self.sso_is_valid = sso_is_valid
         self.requires_sso = requires_sso
 
 
-def from_request(request, organization, scopes=None):
+# sentinel for from_request when the caller has not looked up the member
+_MEMBER_UNKNOWN = object()
+
+
+def from_request(request, organization, scopes=None, member=_MEMBER_UNKNOWN):
+    """
+    Returns access for the request's user.
+
+    If the caller has already fetched the user's OrganizationMember it can be
+    passed as ``member`` (or None if they're known not to be a member) to
+    avoid looking it up again.
+    """
     if not organization:
         return DEFAULT
 
     if request.is_superuser():
-        # we special case superuser so that if they're a member of the org
-        # they must still follow SSO checks, but they gain global access
-        try:
-            member = OrganizationMember.objects.get(
-                user=request.user,
-                organization=organization,
-            )
-        except OrganizationMember.DoesNotExist:
-            requires_sso, sso_is_valid = False, True
-        else:
-            requires_sso, sso_is_valid = _sso_params(member)
-
-        team_list = list(organization.team_set.all())
-        return Access(
-            scopes=scopes if scopes is not None else settings.SENTRY_SCOPES,
-            is_active=True,
-            teams=team_list,
-            memberships=team_list,
-            sso_is_valid=sso_is_valid,
-            requires_sso=requires_sso,
-        )
-    return from_user(request.user, organization, scopes=scopes)
+        if member is _MEMBER_UNKNOWN:
+            try:
+                member = OrganizationMember.objects.get(
+                    user=request.user,
+                    organization=organization,
+                )
+            except OrganizationMember.DoesNotExist:
+                member = None
+        return from_superuser(organization, member, scopes=scopes)
+
+    if member is _MEMBER_UNKNOWN:
+        return from_user(request.user, organization, scopes=scopes)
+    if member is None:
+        return DEFAULT
+    return from_member(member, scopes=scopes)
+
+
+def from_superuser(organization, member=None, scopes=None):
+    # we special case superuser so that if they're a member of the org
+    # they must still follow SSO checks, but they gain global access
+    if member is None:
+        requires_sso, sso_is_valid = False, True
+    else:
+        requires_sso, sso_is_valid = _sso_params(member)
+
+    team_list = list(organization.team_set.all())
+    return Access(
+        scopes=scopes if scopes is not None else settings.SENTRY_SCOPES,
+        is_active=True,
+        teams=team_list,
+        memberships=team_list,
+        sso_is_valid=sso_is_valid,
+        requires_sso=requires_sso,
+    )
 
 
 def from_user(user, organization, scopes=None):
@@ -131,6 +156,9 @@ def from_user(user, organization, scopes=None):
     if user.is_anonymous():
         return DEFAULT
 
+    # the full row is fetched intentionally here, as only() would
+    # cause a query per deferred field as BaseModel reads every field to
+    # track changes on init, and from_member needs a real model instance
     try:
         om = OrganizationMember.objects.get(
             user=user,
@@ -150,8 +178,10 @@ def from_member(member, scopes=None):
     # network hops and needed in a lot of places
     requires_sso, sso_is_valid = _sso_params(member)
 
-    team_memberships = member.get_teams()
-    if member.organization.flags.allow_joinleave:
+    team_memberships = list(member.get_teams())
+    # global roles are already members of every team in the organization so
+    # there's no need to query the full team list a second time
+    if member.organization.flags.allow_joinleave and not roles.get(member.role).is_global:
         team_access = list(member.organization.team_set.all())
     else:
         team_access = team_memberships
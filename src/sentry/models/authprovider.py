@@ -5,9 +5,46 @@ from django.db import models
 from django.utils import timezone
 
 from sentry.db.models import (
-    BoundedPositiveIntegerField, EncryptedJsonField, FlexibleForeignKey, Model,
-    sane_repr
+    BaseManager, BoundedPositiveIntegerField, EncryptedJsonField,
+    FlexibleForeignKey, Model, sane_repr
 )
+from sentry.utils.cache import cache
+
+
+class AuthProviderManager(BaseManager):
+    # Missing results are only cached briefly. A lookup that misses can race
+    # with a provider being created (e.g. inside the SSO setup transaction)
+    # and store the marker after post_save has already cleared it, leaving
+    # SSO unenforced until the marker expires. A short TTL bounds that window
+    # while still absorbing the repeated lookups of busy organizations.
+    missing_cache_ttl = 10
+
+    def _make_missing_key(self, organization_id):
+        return '%s:missing:%s' % (self.model._meta.db_table, organization_id)
+
+    def get_for_organization(self, organization_id):
+        """
+        Returns the AuthProvider for the organization, or None if it has not
+        configured one.
+
+        Most organizations don't have a provider, so unlike get_from_cache
+        the missing result is cached as well.
+        """
+        missing_key = self._make_missing_key(organization_id)
+        if cache.get(missing_key):
+            return None
+
+        try:
+            return self.get_from_cache(organization=organization_id)
+        except self.model.DoesNotExist:
+            cache.set(missing_key, '1', self.missing_cache_ttl)
+            return None
+
+    def post_save(self, instance, **kwargs):
+        cache.delete(self._make_missing_key(instance.organization_id))
+
+    def post_delete(self, instance, **kwargs):
+        cache.delete(self._make_missing_key(instance.organization_id))
 
 
 class AuthProvider(Model):
@@ -32,6 +69,11 @@ class AuthProvider(Model):
         ('allow_unlinked', 'Grant access to members who have not linked SSO accounts.'),
     ), default=0)
 
+    objects = AuthProviderManager(cache_fields=(
+        'pk',
+        'organization',
+    ))
+
     class Meta:
         app_label = 'sentry'
         db_table = 'sentry_authprovider'
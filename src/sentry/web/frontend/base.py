@@ -1,12 +1,13 @@
 from __future__ import absolute_import
 
 import logging
-import six
 
+from django.conf import settings
 from django.core.context_processors import csrf
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseRedirect
 from django.utils.decorators import method_decorator
+from django.utils.functional import cached_property
 from django.views.decorators.csrf import csrf_protect
 from django.views.generic import View
 from sudo.views import redirect_to_sudo
@@ -51,8 +52,9 @@ class OrganizationMixin(object):
 
         is_implicit = organization_slug is None
 
+        session_slug = request.session.get('activeorg')
         if is_implicit:
-            organization_slug = request.session.get('activeorg')
+            organization_slug = session_slug
 
         if organization_slug is not None:
             if request.is_superuser():
@@ -66,28 +68,26 @@ class OrganizationMixin(object):
                     logger.info('Active organization [%s] not found',
                         organization_slug)
 
-        if active_organization is None:
-            organizations = Organization.objects.get_for_user(
-                user=request.user,
-            )
-
         if active_organization is None and organization_slug:
-            try:
-                active_organization = six.next(
-                    o for o in organizations
-                    if o.slug == organization_slug
-                )
-            except StopIteration:
+            active_organization = self._get_organization_for_user(
+                request.user, organization_slug,
+            )
+            if active_organization is None:
                 logger.info('Active organization [%s] not found in scope',
                     organization_slug)
                 if is_implicit:
-                    del request.session['activeorg']
-                active_organization = None
+                    # pop() only marks the session as modified if the key
+                    # was actually present
+                    request.session.pop('activeorg', None)
+                    session_slug = None
 
         if active_organization is None:
             if not is_implicit:
                 return None
 
+            organizations = Organization.objects.get_for_user(
+                user=request.user,
+            )
             try:
                 active_organization = organizations[0]
             except IndexError:
@@ -95,18 +95,86 @@ class OrganizationMixin(object):
                 pass
 
         if active_organization and self._is_org_member(request.user, active_organization):
-            if active_organization.slug != request.session.get('activeorg'):
+            # avoid dirtying the session (and persisting it) unless the
+            # value has actually changed
+            if active_organization.slug != session_slug:
                 request.session['activeorg'] = active_organization.slug
 
         self._active_org = (active_organization, request.user)
 
         return active_organization
 
+    def _get_organization_for_user(self, user, organization_slug):
+        """
+        Returns the visible organization matching the slug if the user has
+        access to it, or None.
+
+        This mirrors the scoping of ``Organization.objects.get_for_user`` but
+        resolves a single slug with an indexed query rather than loading every
+        organization the user belongs to. Status is checked in the database
+        as it's changed via queryset updates which don't invalidate the
+        organization cache.
+        """
+        if not user.is_authenticated():
+            return None
+
+        if settings.SENTRY_PUBLIC:
+            try:
+                return Organization.objects.get(
+                    slug=organization_slug,
+                    status=OrganizationStatus.VISIBLE,
+                )
+            except Organization.DoesNotExist:
+                return None
+
+        try:
+            member = OrganizationMember.objects.select_related('organization').get(
+                user=user,
+                organization__slug=organization_slug,
+                organization__status=OrganizationStatus.VISIBLE,
+            )
+        except OrganizationMember.DoesNotExist:
+            return None
+
+        organization = member.organization
+        self._get_member_cache()[(user.id, organization.id)] = member
+        return organization
+
     def _is_org_member(self, user, organization):
-        return OrganizationMember.objects.filter(
-            user=user,
-            organization=organization,
-        ).exists()
+        return self.get_active_member(user, organization) is not None
+
+    def _get_member_cache(self):
+        member_cache = getattr(self, '_active_members', None)
+        if member_cache is None:
+            member_cache = self._active_members = {}
+        return member_cache
+
+    def get_active_member(self, user, organization):
+        """
+        Returns the OrganizationMember for the given user or None if they are
+        not a member of the organization.
+
+        The result is memoized as membership is checked several times over
+        the course of a single request.
+        """
+        if not user.is_authenticated():
+            return None
+
+        member_cache = self._get_member_cache()
+        cache_key = (user.id, organization.id)
+        if cache_key not in member_cache:
+            try:
+                member = OrganizationMember.objects.get(
+                    user=user,
+                    organization=organization,
+                )
+            except OrganizationMember.DoesNotExist:
+                member = None
+            else:
+                # ensure cached relation
+                member.organization = organization
+            member_cache[cache_key] = member
+        return member_cache[cache_key]
 
     def get_active_team(self, request, organization, team_slug):
         """
@@ -124,6 +192,9 @@ class OrganizationMixin(object):
         if team.status != TeamStatus.VISIBLE:
             return None
 
+        # ensure cached relation
+        team.organization = organization
+
         return team
 
     def get_active_project(self, request, organization, project_slug):
@@ -138,6 +209,9 @@ class OrganizationMixin(object):
         if project.status != ProjectStatus.VISIBLE:
             return None
 
+        # ensure cached relation
+        project.organization = organization
+
         return project
 
     def redirect_to_org(self, request):
@@ -182,10 +256,18 @@ class BaseView(View, OrganizationMixin):
             return self.handle_permission_required(request, *args, **kwargs)
 
         self.request = request
-        self.default_context = self.get_context_data(request, *args, **kwargs)
+        self._context_args = (args, kwargs)
 
         return self.handle(request, *args, **kwargs)
 
+    @cached_property
+    def default_context(self):
+        # computed lazily so views which only redirect never pay for the
+        # context (csrf token, team list, etc). Note that this means the
+        # context reflects any changes made by handle() before it responds.
+        args, kwargs = self._context_args
+        return self.get_context_data(self.request, *args, **kwargs)
+
     def get_access(self, request, *args, **kwargs):
         return access.DEFAULT
 
@@ -290,7 +372,11 @@ class OrganizationView(BaseView):
     def get_access(self, request, organization, *args, **kwargs):
         if organization is None:
             return access.DEFAULT
-        return access.from_request(request, organization)
+        return access.from_request(
+            request,
+            organization,
+            member=self.get_active_member(request.user, organization),
+        )
 
     def get_context_data(self, request, organization, **kwargs):
         context = super(OrganizationView, self).get_context_data(request)
@@ -383,10 +469,7 @@ class OrganizationView(BaseView):
 
         allowed_roles = []
         if can_admin and not request.is_superuser():
-            acting_member = OrganizationMember.objects.get(
-                user=request.user,
-                organization=organization,
-            )
+            acting_member = self.get_active_member(request.user, organization)
             if member and roles.get(acting_member.role).priority < roles.get(member.role).priority:
                 can_admin = False
             else:
@@ -505,7 +588,10 @@ class ProjectView(TeamView):
             active_project = None
 
         if active_project:
-            active_team = active_project.team
+            # avoid the uncached foreign key lookup on project.team
+            active_team = Team.objects.get_from_cache(id=active_project.team_id)
+            active_team.organization = active_organization
+            active_project.team = active_team
         else:
             active_team = None
 
@@ -1,6 +1,8 @@
 from __future__ import absolute_import
 
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from mock import Mock
 
 from sentry.auth import access
@@ -37,6 +39,25 @@ class FromUserTest(TestCase):
         assert result.has_team_access(team)
         assert result.has_team_membership(team)
 
+    def test_owner_open_membership_single_team_query(self):
+        user = self.create_user()
+        organization = self.create_organization(
+            owner=user,
+            flags=Organization.flags.allow_joinleave,
+        )
+        team = self.create_team(organization=organization)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = access.from_user(user, organization)
+
+        team_queries = [
+            q for q in queries.captured_queries
+            if 'FROM "sentry_team"' in q['sql']
+        ]
+        assert len(team_queries) == 1
+        assert result.has_team_access(team)
+        assert result.has_team_membership(team)
+
     def test_member_no_teams_closed_membership(self):
         user = self.create_user()
         organization = self.create_organization(
@@ -117,6 +138,39 @@ class FromUserTest(TestCase):
         result = access.from_user(user, organization)
         assert result.sso_is_valid
 
+    def test_sso_provider_removed(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        self.create_team(organization=organization)
+        auth_provider = AuthProvider.objects.create(
+            organization=organization,
+            provider='dummy',
+        )
+
+        result = access.from_user(user, organization)
+        assert not result.sso_is_valid
+
+        auth_provider.delete()
+
+        result = access.from_user(user, organization)
+        assert result.sso_is_valid
+
+    def test_sso_provider_added(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        self.create_team(organization=organization)
+
+        result = access.from_user(user, organization)
+        assert result.sso_is_valid
+
+        AuthProvider.objects.create(
+            organization=organization,
+            provider='dummy',
+        )
+
+        result = access.from_user(user, organization)
+        assert not result.sso_is_valid
+
     def test_anonymous_user(self):
         user = self.create_user()
         anon_user = AnonymousUser()
@@ -126,6 +180,24 @@ class FromUserTest(TestCase):
         assert not result.is_active
 
 
+class AccessTest(TestCase):
+    def test_inactive(self):
+        organization = self.create_organization()
+        team = self.create_team(organization=organization)
+
+        result = access.Access(
+            scopes=frozenset(['org:read']),
+            is_active=False,
+            teams=[team],
+            memberships=[team],
+            sso_is_valid=True,
+            requires_sso=False,
+        )
+        assert not result.has_scope('org:read')
+        assert not result.has_team_access(team)
+        assert not result.has_team_membership(team)
+
+
 class DefaultAccessTest(TestCase):
     def test_no_access(self):
         result = access.DEFAULT
@@ -134,3 +206,66 @@ class DefaultAccessTest(TestCase):
         assert not result.scopes
         assert not result.has_team_access(Mock())
         assert not result.has_team_membership(Mock())
+
+
+class FromSuperuserTest(TestCase):
+    def test_non_member(self):
+        organization = self.create_organization()
+        team = self.create_team(organization=organization)
+
+        result = access.from_superuser(organization)
+        assert result.is_active
+        assert result.sso_is_valid
+        assert not result.requires_sso
+        assert result.has_team_access(team)
+        assert result.has_team_membership(team)
+
+    def test_member_unlinked_sso(self):
+        user = self.create_user(is_superuser=True)
+        organization = self.create_organization(owner=user)
+        AuthProvider.objects.create(
+            organization=organization,
+            provider='dummy',
+        )
+        member = organization.member_set.get(user=user)
+
+        result = access.from_superuser(organization, member)
+        assert result.is_active
+        assert result.requires_sso
+        assert not result.sso_is_valid
+
+
+class FromRequestTest(TestCase):
+    def make_request(self, user, is_superuser=False):
+        return Mock(user=user, is_superuser=lambda: is_superuser)
+
+    def test_known_member(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        member = organization.member_set.get(user=user)
+
+        result = access.from_request(
+            self.make_request(user), organization, member=member,
+        )
+        assert result.is_active
+        assert result.scopes == member.get_scopes()
+
+    def test_known_non_member(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+
+        result = access.from_request(
+            self.make_request(user), organization, member=None,
+        )
+        assert result is access.DEFAULT
+
+    def test_superuser_known_non_member(self):
+        user = self.create_user(is_superuser=True)
+        organization = self.create_organization(owner=user)
+
+        result = access.from_request(
+            self.make_request(user, is_superuser=True), organization,
+            member=None,
+        )
+        assert result.is_active
+        assert not result.requires_sso
@@ -0,0 +1,275 @@
+from __future__ import absolute_import
+
+from django.conf import settings
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from mock import patch
+
+from sentry.auth import access
+from sentry.middleware.auth import AuthenticationMiddleware
+from sentry.middleware.superuser import SuperuserMiddleware
+from sentry.models import AuthProvider, Organization, OrganizationStatus
+from sentry.testutils import TestCase
+from sentry.utils.auth import login
+from sentry.web.frontend.base import OrganizationView, ProjectView
+
+
+class RedirectOrganizationView(OrganizationView):
+    def handle(self, request, organization):
+        return self.redirect('/')
+
+
+class AdminRedirectOrganizationView(RedirectOrganizationView):
+    required_scope = 'org:admin'
+
+
+class ContextOrganizationView(OrganizationView):
+    def handle(self, request, organization):
+        self.default_context
+        self.default_context
+        return self.redirect('/')
+
+
+class BaseViewTestCase(TestCase):
+    def make_request(self, user=None):
+        request = RequestFactory().get('/')
+        request.session = self.session
+        if user is not None:
+            assert login(request, user)
+        AuthenticationMiddleware().process_request(request)
+        SuperuserMiddleware().process_request(request)
+        return request
+
+
+class OrganizationMixinTest(BaseViewTestCase):
+    def test_member_slug(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        request = self.make_request(user)
+
+        result = OrganizationView().get_active_organization(
+            request, organization.slug,
+        )
+        assert result == organization
+        assert request.session['activeorg'] == organization.slug
+
+    def test_non_member_slug(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=self.create_user())
+        request = self.make_request(user)
+
+        result = OrganizationView().get_active_organization(
+            request, organization.slug,
+        )
+        assert result is None
+        assert 'activeorg' not in request.session
+
+    def test_non_visible_organization(self):
+        user = self.create_user()
+        organization = self.create_organization(
+            owner=user,
+            status=OrganizationStatus.PENDING_DELETION,
+        )
+        request = self.make_request(user)
+
+        result = OrganizationView().get_active_organization(
+            request, organization.slug,
+        )
+        assert result is None
+
+    def test_removed_organization(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        # warm the cache, which queryset updates do not invalidate
+        Organization.objects.get_from_cache(slug=organization.slug)
+        Organization.objects.filter(id=organization.id).update(
+            status=OrganizationStatus.PENDING_DELETION,
+        )
+        request = self.make_request(user)
+
+        result = OrganizationView().get_active_organization(
+            request, organization.slug,
+        )
+        assert result is None
+
+    def test_implicit_slug_fallback(self):
+        user = self.create_user()
+        removed_org = self.create_organization(owner=user)
+        Organization.objects.filter(id=removed_org.id).update(
+            status=OrganizationStatus.PENDING_DELETION,
+        )
+        organization = self.create_organization(owner=user)
+        request = self.make_request(user)
+        request.session['activeorg'] = removed_org.slug
+
+        result = OrganizationView().get_active_organization(request)
+        assert result == organization
+        assert request.session['activeorg'] == organization.slug
+
+    def test_anonymous_user(self):
+        organization = self.create_organization()
+        request = self.make_request()
+
+        result = OrganizationView().get_active_organization(
+            request, organization.slug,
+        )
+        assert result is None
+
+
+class LazyDefaultContextTest(BaseViewTestCase):
+    @patch.object(RedirectOrganizationView, 'get_context_data')
+    def test_redirect_only_handler(self, get_context_data):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        request = self.make_request(user)
+
+        resp = RedirectOrganizationView.as_view()(
+            request, organization_slug=organization.slug,
+        )
+        assert resp.status_code == 302
+        assert not get_context_data.called
+
+    @patch.object(AdminRedirectOrganizationView, 'get_context_data')
+    def test_permission_required(self, get_context_data):
+        user = self.create_user()
+        organization = self.create_organization(owner=self.create_user())
+        self.create_member(organization=organization, user=user, role='member')
+        request = self.make_request(user)
+
+        resp = AdminRedirectOrganizationView.as_view()(
+            request, organization_slug=organization.slug,
+        )
+        assert resp.status_code == 302
+        assert not get_context_data.called
+
+    @patch.object(ContextOrganizationView, 'get_context_data', return_value={})
+    def test_built_once_on_access(self, get_context_data):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        request = self.make_request(user)
+
+        resp = ContextOrganizationView.as_view()(
+            request, organization_slug=organization.slug,
+        )
+        assert resp.status_code == 302
+        get_context_data.assert_called_once_with(
+            request, organization=organization,
+        )
+
+
+class OrganizationViewAccessTest(BaseViewTestCase):
+    def test_member_single_lookup(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        member = organization.member_set.get(user=user)
+        request = self.make_request(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = RedirectOrganizationView.as_view()(
+                request, organization_slug=organization.slug,
+            )
+        assert resp.status_code == 302
+
+        member_queries = [
+            q for q in queries.captured_queries
+            if '"sentry_organizationmember"."role"' in q['sql']
+        ]
+        assert len(member_queries) == 1
+
+        assert request.access.is_active
+        assert request.access.scopes == member.get_scopes()
+
+    def test_superuser_member_requires_sso(self):
+        user = self.create_user(is_superuser=True)
+        organization = self.create_organization(owner=user)
+        AuthProvider.objects.create(
+            organization=organization,
+            provider='dummy',
+        )
+        request = self.make_request(user)
+        assert request.is_superuser()
+
+        result = OrganizationView().get_access(request, organization)
+        assert result.is_active
+        assert result.scopes == settings.SENTRY_SCOPES
+        assert result.requires_sso
+        assert not result.sso_is_valid
+
+    def test_superuser_non_member(self):
+        user = self.create_user(is_superuser=True)
+        organization = self.create_organization(owner=self.create_user())
+        request = self.make_request(user)
+        assert request.is_superuser()
+
+        result = OrganizationView().get_access(request, organization)
+        assert result.is_active
+        assert not result.requires_sso
+        assert result.sso_is_valid
+
+    def test_non_member(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=self.create_user())
+        request = self.make_request(user)
+
+        result = OrganizationView().get_access(request, organization)
+        assert result is access.DEFAULT
+
+
+class ProjectViewTest(BaseViewTestCase):
+    def test_convert_args_uses_cached_relations(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        team = self.create_team(organization=organization)
+        project = self.create_project(organization=organization, team=team)
+        request = self.make_request(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            args, kwargs = ProjectView().convert_args(
+                request, organization.slug, project.slug,
+            )
+        team_queries = [
+            q for q in queries.captured_queries
+            if '"sentry_team"' in q['sql']
+        ]
+        assert not team_queries
+
+        with self.assertNumQueries(0):
+            assert kwargs['project'].team == team
+            assert kwargs['team'].organization == organization
+            assert kwargs['project'].organization == organization
+
+
+class ActiveOrganizationSessionTest(BaseViewTestCase):
+    def test_unchanged_session_not_modified(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        request = self.make_request(user)
+        request.session['activeorg'] = organization.slug
+        request.session.modified = False
+
+        result = OrganizationView().get_active_organization(
+            request, organization.slug,
+        )
+        assert result == organization
+        assert not request.session.modified
+
+    def test_unchanged_implicit_session_not_modified(self):
+        user = self.create_user()
+        organization = self.create_organization(owner=user)
+        request = self.make_request(user)
+        request.session['activeorg'] = organization.slug
+        request.session.modified = False
+
+        result = OrganizationView().get_active_organization(request)
+        assert result == organization
+        assert not request.session.modified
+
+    def test_stale_implicit_slug_removed(self):
+        user = self.create_user()
+        request = self.make_request(user)
+        request.session['activeorg'] = 'does-not-exist'
+
+        result = OrganizationView().get_active_organization(request)
+        assert result is None
+        assert 'activeorg' not in request.session